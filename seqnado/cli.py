@@ -74,7 +74,13 @@ def cli_init(preset):
 @click.command(context_settings=dict(ignore_unknown_options=True))
 @click.argument("method", type=click.Choice(["atac", "chip", "rna", "snp"]))
 @click.option("-r", "--rerun", is_flag=True, help="Re-run the config")
-def cli_config(method, rerun=False):
+@click.option(
+    "-a",
+    "--answers",
+    type=click.Path(exists=True, dir_okay=False),
+    help="YAML file of answers to use instead of prompting",
+)
+def cli_config(method, rerun=False, answers=None):
     """
     Runs the config for the data processing pipeline.
     """
@@ -83,7 +89,9 @@ def cli_config(method, rerun=False):
 
     seqnado_version = version("seqnado")
 
-    config.create_config(method, rerun, seqnado_version=seqnado_version)
+    config.create_config(
+        method, rerun, seqnado_version=seqnado_version, answers_file=answers
+    )
 
 
 # Design
@@ -1,56 +1,503 @@
 import datetime
+import functools
 import json
 import os
 import pathlib
 import sys
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
 
-from jinja2 import Environment, FileSystemLoader
+import yaml
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from loguru import logger
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger.add(sys.stderr, level="INFO")
 
 package_dir = os.path.dirname(os.path.abspath(__file__))
 template_dir = os.path.join(package_dir, "workflow/config")
 
+# Looked up once per process; a config run never spans midnight in practice
+_USERNAME = os.getenv("USER", "unknown_user")
+_TODAY = datetime.date.today().isoformat()
+
+
+def _get_bytecode_cache():
+    """
+    Persist compiled templates across runs unless SEQNADO_JINJA_CACHE=0.
+    """
+    if os.getenv("SEQNADO_JINJA_CACHE", "1") == "0":
+        return None
+
+    cache_dir = os.path.expanduser("~/.cache/seqnado/jinja")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        logger.debug(f"Could not create Jinja cache directory {cache_dir}")
+        return None
+    return FileSystemBytecodeCache(directory=cache_dir, pattern="%s.cache")
+
+
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(template_dir),
+    auto_reload=False,
+    cache_size=50,
+    bytecode_cache=_get_bytecode_cache(),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_template(name):
+    return _JINJA_ENV.get_template(name)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_genome_config_file(config_root: str) -> pathlib.Path:
+    return pathlib.Path(config_root) / ".config" / "seqnado" / "genome_config.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_genome_config(path: str) -> dict:
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+_STDIN_EXHAUSTED = False
+
 
 def get_user_input(prompt, default=None, is_boolean=False, choices=None):
+    global _STDIN_EXHAUSTED
+    choice_set = frozenset(choices) if choices else None
+    full_prompt = f"{prompt} [{'/'.join(choices) if choices else default}]: "
+    invalid_choice_message = (
+        f"Invalid choice. Please choose from {', '.join(choices)}." if choices else ""
+    )
     while True:
-        user_input = (
-            input(f"{prompt} [{'/'.join(choices) if choices else default}]: ")
-            or default
-        )
+        if not _STDIN_EXHAUSTED:
+            try:
+                user_input = input(full_prompt) or default
+            except EOFError:
+                # Answers piped in have run out; use defaults for the rest
+                if sys.stdin.isatty():
+                    raise
+                logger.info("No more answers provided, using default values.")
+                _STDIN_EXHAUSTED = True
+        if _STDIN_EXHAUSTED:
+            # There is no one left to re-ask, so take the default as given
+            return default.lower() == "yes" if is_boolean else default
         if is_boolean:
             return user_input.lower() == "yes"
-        if choices and user_input not in choices:
-            print(f"Invalid choice. Please choose from {', '.join(choices)}.")
+        if choice_set and user_input not in choice_set:
+            print(invalid_choice_message)
             continue
         return user_input
 
 
-def setup_configuration(assay, template_data, seqnado_version):
-    genome_config_path = pathlib.Path(
-        os.getenv(
-            "SEQNADO_CONFIG",
-            pathlib.Path.home(),
+_NOT_SET = object()
+
+
+@dataclass
+class PromptSpec:
+    """
+    A question asked by seqnado-config.
+
+    The default and fallback can be callables taking the answers collected
+    so far. If `when` returns False the question is skipped and the fallback
+    is stored instead (nothing is stored if no fallback is given).
+    """
+
+    key: str
+    prompt: str
+    default: Any = None
+    is_boolean: bool = False
+    choices: Optional[List[str]] = None
+    when: Optional[Callable[[dict], bool]] = None
+    fallback: Any = _NOT_SET
+    transform: Optional[Callable[[Any], Any]] = None
+
+
+def _coerce_answer(spec: PromptSpec, value: Any) -> Any:
+    """
+    Validate an answer supplied in an answers file.
+    """
+    if spec.is_boolean:
+        from seqnado.helpers import is_off, is_on
+
+        if is_on(value):
+            return True
+        if is_off(value):
+            return False
+        logger.error(
+            f"Invalid answer '{value}' for '{spec.key}'. Please answer yes or no."
         )
-    )
-    genome_config_file = (
-        genome_config_path / ".config" / "seqnado" / "genome_config.json"
+        sys.exit(1)
+    if spec.choices and value not in spec.choices:
+        logger.error(
+            f"Invalid answer '{value}' for '{spec.key}'. Please choose from {', '.join(spec.choices)}."
+        )
+        sys.exit(1)
+    return value
+
+
+def run_prompts(
+    specs: List[PromptSpec], data: dict, answers: Optional[dict] = None
+) -> dict:
+    """
+    Ask each question in turn, storing the answers in data.
+
+    If a mapping of answers is provided no questions are asked; missing
+    answers take their default value.
+    """
+    for spec in specs:
+        if spec.when is not None and not spec.when(data):
+            fallback = spec.fallback(data) if callable(spec.fallback) else spec.fallback
+            if fallback is not _NOT_SET:
+                data[spec.key] = fallback
+            continue
+
+        default = spec.default(data) if callable(spec.default) else spec.default
+        if answers is not None:
+            value = _coerce_answer(spec, answers.get(spec.key, default))
+        else:
+            value = get_user_input(
+                spec.prompt,
+                default=default,
+                is_boolean=spec.is_boolean,
+                choices=spec.choices,
+            )
+
+        if spec.transform is not None:
+            value = spec.transform(value)
+        data[spec.key] = value
+
+    return data
+
+
+PROJECT_PROMPTS = [
+    PromptSpec(
+        "project_name",
+        "What is your project name?",
+        default=lambda data: f"{data['username']}_project",
+        transform=lambda name: str(name).replace(" ", "_"),
+    ),
+    PromptSpec("genome", "What is the genome?", default="hg38"),
+]
+
+QC_PROMPTS = [
+    # Fastqscreen
+    PromptSpec(
+        "fastq_screen", "Perform fastqscreen? (yes/no)", default="no", is_boolean=True
+    ),
+    PromptSpec(
+        "fastq_screen_config",
+        "Path to fastqscreen config:",
+        default="/ceph/project/milne_group/shared/seqnado_reference/fastqscreen_reference/fastq_screen.conf",
+        when=lambda data: data["fastq_screen"],
+    ),
+    # Blacklist
+    PromptSpec(
+        "remove_blacklist",
+        "Do you want to remove blacklist regions? (yes/no)",
+        default="yes",
+        is_boolean=True,
+    ),
+    # Handle duplicates
+    PromptSpec(
+        "remove_pcr_duplicates",
+        "Remove PCR duplicates? (yes/no)",
+        default=lambda data: "yes" if data["assay"] in ["chip", "atac"] else "no",
+        is_boolean=True,
+    ),
+    PromptSpec(
+        "remove_pcr_duplicates_method",
+        "Remove PCR duplicates method:",
+        default="picard",
+        choices=["picard", "samtools"],
+        when=lambda data: data["remove_pcr_duplicates"],
+        fallback="False",
+    ),
+    # Library Complexity
+    PromptSpec(
+        "library_complexity",
+        "Calculate library complexity? (yes/no)",
+        default="no",
+        is_boolean=True,
+        when=lambda data: data["remove_pcr_duplicates"],
+        fallback="False",
+    ),
+]
+
+ATAC_SHIFT_PROMPTS = [
+    PromptSpec(
+        "shift_atac_reads",
+        "Shift ATAC-seq reads? (yes/no)",
+        default="yes",
+        is_boolean=True,
+    ),
+]
+
+SPIKEIN_PROMPTS = [
+    PromptSpec(
+        "spikein", "Do you have spikein? (yes/no)", default="no", is_boolean=True
+    ),
+]
+
+CHIP_SPIKEIN_PROMPTS = [
+    PromptSpec(
+        "normalisation_method",
+        "Normalisation method:",
+        default="orlando",
+        choices=["orlando", "with_input"],
+        when=lambda data: data["spikein"],
+    ),
+    PromptSpec(
+        "reference_genome",
+        "Reference genome:",
+        default="hg38",
+        when=lambda data: data["spikein"],
+    ),
+    PromptSpec(
+        "spikein_genome",
+        "Spikein genome:",
+        default="dm6",
+        when=lambda data: data["spikein"],
+    ),
+]
+
+BIGWIG_PROMPTS = [
+    PromptSpec(
+        "make_bigwigs",
+        "Do you want to make bigwigs? (yes/no)",
+        default="no",
+        is_boolean=True,
+    ),
+    PromptSpec(
+        "pileup_method",
+        "Pileup method:",
+        default="deeptools",
+        choices=["deeptools", "homer"],
+        when=lambda data: data["make_bigwigs"],
+        fallback="False",
+    ),
+    PromptSpec(
+        "make_heatmaps",
+        "Do you want to make heatmaps? (yes/no)",
+        default="no",
+        is_boolean=True,
+        when=lambda data: data["make_bigwigs"],
+        fallback="False",
+    ),
+]
+
+PEAK_PROMPTS = [
+    PromptSpec(
+        "call_peaks",
+        "Do you want to call peaks? (yes/no)",
+        default="no",
+        is_boolean=True,
+    ),
+    PromptSpec(
+        "peak_calling_method",
+        "Peak caller:",
+        default="lanceotron",
+        choices=["lanceotron", "macs", "homer", "seacr"],
+        when=lambda data: data["call_peaks"],
+    ),
+    PromptSpec(
+        "consenus_counts",
+        "Generate consensus counts from Design merge column? (yes/no)",
+        default="no",
+        is_boolean=True,
+    ),
+]
+
+RNA_PROMPTS = [
+    PromptSpec(
+        "rna_quantification",
+        "RNA quantification method:",
+        default="feature_counts",
+        choices=["feature_counts", "salmon"],
+    ),
+    PromptSpec(
+        "salmon_index",
+        "Path to salmon index:",
+        default="path/to/salmon_index",
+        when=lambda data: data["rna_quantification"] == "salmon",
+        fallback="False",
+    ),
+    # Run DESeq2
+    PromptSpec("run_deseq2", "Run DESeq2? (yes/no)", default="no", is_boolean=True),
+]
+
+SNP_PROMPTS = [
+    PromptSpec("call_snps", "Call SNPs? (yes/no)", default="no", is_boolean=True),
+    PromptSpec(
+        "snp_calling_method",
+        "SNP caller:",
+        default="bcftools",
+        choices=["bcftools", "deepvariant"],
+        when=lambda data: data["call_snps"],
+        fallback="False",
+    ),
+    PromptSpec(
+        "fasta",
+        "Path to reference fasta:",
+        default="path/to/reference.fasta",
+        when=lambda data: data["call_snps"],
+        fallback="False",
+    ),
+    PromptSpec(
+        "fasta_index",
+        "Path to reference fasta index:",
+        default="path/to/reference.fasta.fai",
+        when=lambda data: data["call_snps"],
+        fallback="False",
+    ),
+    PromptSpec(
+        "snp_database",
+        "Path to SNP database:",
+        default="path/to/snp_database",
+        when=lambda data: data["call_snps"],
+        fallback="False",
+    ),
+]
+
+OUTPUT_PROMPTS = [
+    # Make UCSC hub
+    PromptSpec(
+        "make_ucsc_hub",
+        "Do you want to make a UCSC hub? (yes/no)",
+        default="no",
+        is_boolean=True,
+    ),
+    PromptSpec(
+        "UCSC_hub_directory",
+        "UCSC hub directory:",
+        default="seqnado_output/hub/",
+        when=lambda data: data["make_ucsc_hub"],
+        fallback="seqnado_output/hub/",
+    ),
+    PromptSpec(
+        "email",
+        "What is your email address?",
+        default=lambda data: f"{data['username']}@example.com",
+        when=lambda data: data["make_ucsc_hub"],
+        fallback=lambda data: f"{data['username']}@example.com",
+    ),
+    PromptSpec(
+        "color_by",
+        "Color by (for UCSC hub):",
+        default="samplename",
+        when=lambda data: data["make_ucsc_hub"],
+        fallback="samplename",
+    ),
+    PromptSpec(
+        "geo_submission_files",
+        "Generate GEO submission files (MD5Sums, read count summaries...)? (yes/no)",
+        default="no",
+        is_boolean=True,
+    ),
+    # Plotting
+    PromptSpec(
+        "perform_plotting", "Perform plotting? (yes/no)", default="no", is_boolean=True
+    ),
+    PromptSpec(
+        "plotting_coordinates",
+        "Path to bed file with coordinates for plotting",
+        default=None,
+        when=lambda data: data["perform_plotting"],
+        fallback=None,
+    ),
+]
+
+# Questions asked for each assay, in order
+ASSAY_PROMPTS = {
+    "chip": [
+        *QC_PROMPTS,
+        *SPIKEIN_PROMPTS,
+        *CHIP_SPIKEIN_PROMPTS,
+        *BIGWIG_PROMPTS,
+        *PEAK_PROMPTS,
+        *OUTPUT_PROMPTS,
+    ],
+    "atac": [
+        *QC_PROMPTS,
+        *ATAC_SHIFT_PROMPTS,
+        *BIGWIG_PROMPTS,
+        *PEAK_PROMPTS,
+        *OUTPUT_PROMPTS,
+    ],
+    "rna": [
+        *QC_PROMPTS,
+        *SPIKEIN_PROMPTS,
+        *BIGWIG_PROMPTS,
+        *RNA_PROMPTS,
+        *OUTPUT_PROMPTS,
+    ],
+    "snp": [
+        *QC_PROMPTS,
+        *SNP_PROMPTS,
+        *OUTPUT_PROMPTS,
+    ],
+}
+
+# Values used for the sections of the config that do not apply to an assay
+RNA_DISABLED = {
+    "rna_quantification": "False",
+    "salmon_index": "False",
+    "run_deseq2": "False",
+}
+SNP_DISABLED = {
+    "call_snps": "False",
+    "snp_calling_method": "False",
+    "fasta": "False",
+    "fasta_index": "False",
+    "snp_database": "False",
+}
+ASSAY_DISABLED = {
+    "chip": {**RNA_DISABLED, **SNP_DISABLED},
+    "atac": {**RNA_DISABLED, **SNP_DISABLED},
+    "rna": SNP_DISABLED,
+    "snp": RNA_DISABLED,
+}
+
+PLOTTING_GENES_PROMPTS = [
+    PromptSpec(
+        "plotting_genes",
+        "Path to bed file with genes.",
+        default=None,
+        when=lambda data: data["perform_plotting"] and not data["plotting_genes"],
+    ),
+]
+
+
+def setup_configuration(assay, template_data, seqnado_version, answers=None):
+    global _STDIN_EXHAUSTED
+    _STDIN_EXHAUSTED = False
+    genome_config_file = _get_genome_config_file(
+        os.getenv("SEQNADO_CONFIG", str(pathlib.Path.home()))
     )
     if not genome_config_file.exists():
         logger.info(
             "Genome config file not found. Please run 'seqnado-init' to create the genome config file."
         )
         sys.exit(1)
-    else:
-        with open(genome_config_file) as f:
-            genome_values = json.load(f)
-    username = os.getenv("USER", "unknown_user")
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
-    project_name = get_user_input(
-        "What is your project name?", default=f"{username}_project"
-    ).replace(" ", "_")
-    genome = get_user_input("What is the genome?", default="hg38")
+    template_data.update(
+        {
+            "username": _USERNAME,
+            "project_date": _TODAY,
+            "seqnado_version": seqnado_version,
+        }
+    )
+    run_prompts(PROJECT_PROMPTS, template_data, answers)
+    genome = template_data["genome"]
+    genome_values = _load_genome_config(str(genome_config_file))
     if genome in genome_values:
         genome_config = {
             "index": genome_values[genome][
@@ -66,216 +513,21 @@ def setup_configuration(assay, template_data, seqnado_version):
             f"Genome '{genome}' not found in genome config file. Please update the genome config file: {genome_config_file}"
         )
         sys.exit(1)
-    common_config = {
-        "username": username,
-        "project_date": today,
-        "project_name": project_name,
-        "seqnado_version": seqnado_version,
-        "genome": genome,
-    }
-    template_data.update(common_config)
-    # Fastqscreen
-    template_data["fastq_screen"] = get_user_input(
-        "Perform fastqscreen? (yes/no)", default="no", is_boolean=True
-    )
-    if template_data["fastq_screen"]:
-        template_data["fastq_screen_config"] = get_user_input(
-            "Path to fastqscreen config:",
-            default="/ceph/project/milne_group/shared/seqnado_reference/fastqscreen_reference/fastq_screen.conf",
-        )
-    # Blacklist
-    template_data["remove_blacklist"] = get_user_input(
-        "Do you want to remove blacklist regions? (yes/no)",
-        default="yes",
-        is_boolean=True,
-    )
+
+    template_data.update(ASSAY_DISABLED[assay])
+    run_prompts(ASSAY_PROMPTS[assay], template_data, answers)
     if template_data["remove_blacklist"]:
         template_data["blacklist"] = genome_values[genome]["blacklist"]
-    # Handle duplicates
-    template_data["remove_pcr_duplicates"] = get_user_input(
-        "Remove PCR duplicates? (yes/no)",
-        default="yes" if assay in ["chip", "atac"] else "no",
-        is_boolean=True,
-    )
-    if template_data["remove_pcr_duplicates"]:
-        template_data["remove_pcr_duplicates_method"] = get_user_input(
-            "Remove PCR duplicates method:",
-            default="picard",
-            choices=["picard", "samtools"],
-        )
-        # Library Complexity
-        template_data["library_complexity"] = get_user_input(
-            "Calculate library complexity? (yes/no)", default="no", is_boolean=True
-        )
-    else:
-        template_data["remove_pcr_duplicates_method"] = "False"
-        template_data["library_complexity"] = "False"
-    # Shift reads
-    if assay == "atac":
-        template_data["shift_atac_reads"] = (
-            get_user_input(
-                "Shift ATAC-seq reads? (yes/no)", default="yes", is_boolean=True
-            )
-            if assay == "atac"
-            else "False"
-        )
-    # Spike in
-    if assay in ["chip", "rna"]:
-        template_data["spikein"] = get_user_input(
-            "Do you have spikein? (yes/no)", default="no", is_boolean=True
-        )
-        if template_data["spikein"] and not assay == "rna":
-            template_data["normalisation_method"] = get_user_input(
-                "Normalisation method:",
-                default="orlando",
-                choices=["orlando", "with_input"],
-            )
-            template_data["reference_genome"] = get_user_input(
-                "Reference genome:", default="hg38"
-            )
-            template_data["spikein_genome"] = get_user_input(
-                "Spikein genome:", default="dm6"
-            )
-    # Make bigwigs
-    if assay not in ["snp"]:
-        template_data["make_bigwigs"] = get_user_input(
-            "Do you want to make bigwigs? (yes/no)", default="no", is_boolean=True
-        )
-        if template_data["make_bigwigs"]:
-            template_data["pileup_method"] = get_user_input(
-                "Pileup method:",
-                default="deeptools",
-                choices=["deeptools", "homer"],
-            )
-            # template_data["scale"] = get_user_input(
-            #     "Scale bigwigs? (yes/no)", default="no", is_boolean=True
-            # )
-            template_data["make_heatmaps"] = get_user_input(
-                "Do you want to make heatmaps? (yes/no)", default="no", is_boolean=True
-            )
-        else:
-            template_data["pileup_method"] = "False"
-            template_data["scale"] = "False"
-            template_data["make_heatmaps"] = "False"
-    # Call peaks
-    if assay in ["chip", "atac"]:
-        template_data["call_peaks"] = get_user_input(
-            "Do you want to call peaks? (yes/no)", default="no", is_boolean=True
-        )
-        if template_data["call_peaks"]:
-            template_data["peak_calling_method"] = get_user_input(
-                "Peak caller:",
-                default="lanceotron",
-                choices=["lanceotron", "macs", "homer", "seacr"],
-            )
-    if assay in ["chip", "atac"]:
-        template_data["consenus_counts"] = get_user_input(
-            "Generate consensus counts from Design merge column? (yes/no)",
-            default="no",
-            is_boolean=True,
-        )
-    # RNA options
-    template_data["rna_quantification"] = (
-        get_user_input(
-            "RNA quantification method:",
-            default="feature_counts",
-            choices=["feature_counts", "salmon"],
-        )
-        if assay == "rna"
-        else "False"
-    )
-    template_data["salmon_index"] = (
-        get_user_input(
-            "Path to salmon index:",
-            default="path/to/salmon_index",
-        )
-        if template_data["rna_quantification"] == "salmon"
-        else "False"
-    )
-    # Run DESeq2
-    template_data["run_deseq2"] = (
-        get_user_input("Run DESeq2? (yes/no)", default="no", is_boolean=True)
-        if assay == "rna"
-        else "False"
-    )
-    # SNP options
-    template_data["call_snps"] = (
-        get_user_input("Call SNPs? (yes/no)", default="no", is_boolean=True)
-        if assay == "snp"
-        else "False"
-    )
-    if assay == "snp" and template_data["call_snps"]:
-        template_data["snp_calling_method"] = get_user_input(
-            "SNP caller:",
-            default="bcftools",
-            choices=["bcftools", "deepvariant"],
-        )
-        template_data["fasta"] = get_user_input(
-            "Path to reference fasta:", default="path/to/reference.fasta"
-        )
-        template_data["fasta_index"] = get_user_input(
-            "Path to reference fasta index:", default="path/to/reference.fasta.fai"
-        )
-        template_data["snp_database"] = get_user_input(
-            "Path to SNP database:",
-            default="path/to/snp_database",
-        )
-    else:
-        template_data["snp_calling_method"] = "False"
-        template_data["fasta"] = "False"
-        template_data["fasta_index"] = "False"
-        template_data["snp_database"] = "False"
-    # Make UCSC hub
-    template_data["make_ucsc_hub"] = get_user_input(
-        "Do you want to make a UCSC hub? (yes/no)", default="no", is_boolean=True
-    )
-    template_data["UCSC_hub_directory"] = (
-        get_user_input("UCSC hub directory:", default="seqnado_output/hub/")
-        if template_data["make_ucsc_hub"]
-        else "seqnado_output/hub/"
-    )
-    template_data["email"] = (
-        get_user_input("What is your email address?", default=f"{username}@example.com")
-        if template_data["make_ucsc_hub"]
-        else f"{username}@example.com"
-    )
-    template_data["color_by"] = (
-        get_user_input("Color by (for UCSC hub):", default="samplename")
-        if template_data["make_ucsc_hub"]
-        else "samplename"
-    )
-    template_data["options"] = (
-        TOOL_OPTIONS
-        if assay in ["chip", "atac"]
-        else (
-            TOOL_OPTIONS_RNA
-            if assay == "rna"
-            else TOOL_OPTIONS_SNP
-            if assay == "snp"
-            else ""
-        )
-    )
-    template_data["geo_submission_files"] = get_user_input(
-        "Generate GEO submission files (MD5Sums, read count summaries...)? (yes/no)",
-        default="no",
-        is_boolean=True,
-    )
-    template_data["perform_plotting"] = get_user_input(
-        "Perform plotting? (yes/no)", default="no", is_boolean=True
-    )
-    if template_data["perform_plotting"]:
-        template_data["plotting_coordinates"] = get_user_input(
-            "Path to bed file with coordinates for plotting", default=None
-        )
-        if genome in genome_values and genome_values.get("genes"):
-            template_data["plotting_genes"] = genome_values[genome].get("genes")
-        else:
-            template_data["plotting_genes"] = get_user_input(
-                "Path to bed file with genes.", default=None
-            )
+    if assay not in ["snp"] and not template_data["make_bigwigs"]:
+        template_data["scale"] = "False"
+    template_data["options"] = TOOL_OPTIONS_BY_ASSAY.get(assay, "")
+
+    # Genes for plotting are taken from the genome config if available
+    if template_data["perform_plotting"] and genome_values.get("genes"):
+        template_data["plotting_genes"] = genome_values[genome].get("genes")
     else:
-        template_data["plotting_coordinates"] = None
         template_data["plotting_genes"] = None
+    run_prompts(PLOTTING_GENES_PROMPTS, template_data, answers)
 
 
 TOOL_OPTIONS = """
@@ -391,33 +643,51 @@ bcftools:
     
 """
 
+TOOL_OPTIONS_BY_ASSAY = {
+    "chip": TOOL_OPTIONS,
+    "atac": TOOL_OPTIONS,
+    "rna": TOOL_OPTIONS_RNA,
+    "snp": TOOL_OPTIONS_SNP,
+}
+
+
+def load_answers(answers_file):
+    """
+    Load answers to the seqnado-config questions from a YAML file.
+    """
+    with open(answers_file) as f:
+        answers = yaml.safe_load(f) or {}
+    if not isinstance(answers, dict):
+        logger.error(f"Answers file {answers_file} must contain a mapping of answers.")
+        sys.exit(1)
+    return answers
+
 
-def create_config(assay, rerun, seqnado_version, debug=False):
-    env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False)
-    template = env.get_template("config.yaml.jinja")
-    template_deseq2 = env.get_template("deseq2.qmd.jinja")
+def create_config(assay, rerun, seqnado_version, debug=False, answers_file=None):
+    answers = load_answers(answers_file) if answers_file else None
     # Initialize template data
     template_data = {"assay": assay, "seqnado_version": seqnado_version}
     # Setup configuration
-    setup_configuration(assay, template_data, seqnado_version)
-    # Create directory and render template
+    setup_configuration(assay, template_data, seqnado_version, answers=answers)
+    # Create directory and render templates
     if rerun:
         dir_name = os.getcwd()
-        with open(os.path.join(dir_name, f"config_{assay}.yml"), "w") as file:
-            file.write(template.render(template_data))
     else:
         dir_name = f"{template_data['project_date']}_{template_data['assay']}_{template_data['project_name']}"
-        os.makedirs(dir_name, exist_ok=True)
-        fastq_dir = os.path.join(dir_name, "fastq")
-        os.makedirs(fastq_dir, exist_ok=True)
-        with open(os.path.join(dir_name, f"config_{assay}.yml"), "w") as file:
-            file.write(template.render(template_data))
+        os.makedirs(os.path.join(dir_name, "fastq"), exist_ok=True)
+
+    outputs = [(f"config_{assay}.yml", _get_template("config.yaml.jinja"))]
     # add deseq2 qmd file if rna
     if assay == "rna":
-        with open(
-            os.path.join(dir_name, f"deseq2_{template_data['project_name']}.qmd"), "w"
-        ) as file:
-            file.write(template_deseq2.render(template_data))
+        outputs.append(
+            (
+                f"deseq2_{template_data['project_name']}.qmd",
+                _get_template("deseq2.qmd.jinja"),
+            )
+        )
+    for file_name, template in outputs:
+        with open(os.path.join(dir_name, file_name), "w") as file:
+            template.stream(template_data).dump(file)
     print(
         f"Directory '{dir_name}' has been created with the 'config_{assay}.yml' file."
     )
@@ -13,6 +13,17 @@ from pandera.typing import DataFrame, Index, Series
 from pydantic import BaseModel, Field, computed_field, field_validator, validator
 from snakemake.io import expand
 
+# Applied in order to a fastq sample name to obtain the sample base
+FASTQ_SAMPLE_BASE_SUBSTITUTIONS = [
+    (re.compile(r"_S\d+_"), "_"),
+    (re.compile(r"_L00\d_"), "_"),
+    (re.compile(r"_R?[12](_001)?$"), "_"),
+    (re.compile(r"__"), "_"),
+    (re.compile(r"_$"), ""),
+]
+FASTQ_READ_NUMBER_REGEXES = [re.compile(r".*_R?([12])(_001)?")]
+FASTQ_EXTENSIONS = (".fq", ".fq.gz", ".fastq", ".fastq.gz")
+
 
 def predict_organism(genome: str) -> str:
     if "hg" in genome:
@@ -35,6 +46,23 @@ def is_path(path: Optional[Union[str, pathlib.Path]]) -> Optional[pathlib.Path]:
         return False
 
 
+def find_fastq_files(directory: Union[pathlib.Path, str]) -> List[pathlib.Path]:
+    """
+    Return the sorted fastq files found in a directory.
+
+    Uses a single directory scan rather than one glob per extension.
+    """
+    with os.scandir(directory) as entries:
+        fastq_files = [
+            pathlib.Path(entry.path)
+            for entry in entries
+            if not entry.name.startswith(".")
+            and entry.name.endswith(FASTQ_EXTENSIONS)
+            and entry.is_file()
+        ]
+    return sorted(fastq_files)
+
+
 class FastqFile(BaseModel):
     path: pathlib.Path
     use_resolved_name: bool = False
@@ -63,17 +91,9 @@ class FastqFile(BaseModel):
     @computed_field
     @property
     def sample_base(self) -> str:
-        to_sub = {
-            r"_S\d+_": "_",
-            r"_L00\d_": "_",
-            r"_R?[12](_001)?$": "_",
-            r"__": "_",
-            r"_$": "",
-        }
-
         base = self.sample_name
-        for pattern, rep in to_sub.items():
-            base = re.sub(pattern, rep, base)
+        for pattern, rep in FASTQ_SAMPLE_BASE_SUBSTITUTIONS:
+            base = pattern.sub(rep, base)
         return base
 
     @computed_field
@@ -86,10 +106,7 @@ class FastqFile(BaseModel):
 
         """
 
-        regex_std_illumina_paired = re.compile(r".*_R?([12])(_001)?")
-        regexes = [regex_std_illumina_paired]
-
-        for regex in regexes:
+        for regex in FASTQ_READ_NUMBER_REGEXES:
             match = regex.match(self.sample_name)
             if match:
                 return int(match.group(1))
@@ -453,10 +470,7 @@ class Design(BaseModel):
         Create a Design object from a directory of fastq files.
         """
         directory = pathlib.Path(directory)
-        file_patterns = ["*.fq", "*.fq.gz", "*.fastq", "*.fastq.gz"]
-        fastq_files = sorted(
-            [f for pattern in file_patterns for f in directory.glob(pattern)]
-        )
+        fastq_files = find_fastq_files(directory)
 
         if len(fastq_files) == 0:
             raise FileNotFoundError(f"No fastq files found in {directory}")
@@ -783,10 +797,7 @@ class DesignIP(BaseModel):
         Create a Design object from a directory of fastq files.
         """
         directory = pathlib.Path(directory)
-        file_patterns = ["*.fq", "*.fq.gz", "*.fastq", "*.fastq.gz"]
-        fastq_files = sorted(
-            [f for pattern in file_patterns for f in directory.glob(pattern)]
-        )
+        fastq_files = find_fastq_files(directory)
 
         if len(fastq_files) == 0:
             raise FileNotFoundError(f"No fastq files found in {directory}")
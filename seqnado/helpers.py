@@ -1,7 +1,9 @@
 import json
 import logging
+import os
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -17,6 +19,10 @@ FILETYPE_TO_DIR_MAPPING = {
 
 FILETYPE_TO_EXTENSION_MAPPING = {"tag": "/", "bigwig": ".bigWig", "bam": ".bam"}
 
+ON_VALUES = frozenset(["true", "t", "on", "yes", "y", "1"])
+OFF_VALUES = frozenset(["", "none", "f", "n", "no", "false", "0"])
+NONE_VALUES = frozenset(["", "none"])
+
 
 def extract_cores_from_options(options: List[str]) -> Tuple[List[str], int]:
     """
@@ -67,14 +73,41 @@ def extract_apptainer_args(options: List[str]) -> Tuple[List[str], str]:
     return options, apptainer_args
 
 
+def _scale_memory(attempts: int = 1, initial_value: int = 1, scale: float = 1) -> float:
+    """
+    Scale the base memory (in G) for the attempt number and resource scale.
+    """
+    memory = int(initial_value) * 2 ** (int(attempts) - 1)
+    return memory * float(scale)
+
+
 def define_memory_requested(
     attempts: int = 1, initial_value: int = 1, scale: float = 1
 ) -> str:
     """
     Define the memory requested for the job.
     """
-    memory = int(initial_value) * 2 ** (int(attempts) - 1)
-    memory = memory * float(scale)
+    memory = _scale_memory(attempts, initial_value, scale)
+    return f"{memory}G"
+
+
+# samtools sort -m is per thread; keep it above the 768M default to limit temp files
+SAMTOOLS_SORT_MEMORY_MB = 1024
+SAMTOOLS_SORT_MEMORY = f"{SAMTOOLS_SORT_MEMORY_MB}M"
+
+
+def define_sort_memory_requested(
+    threads: int = 1, attempts: int = 1, initial_value: int = 1, scale: float = 1
+) -> str:
+    """
+    Define the memory requested for a job that runs samtools sort.
+
+    samtools sort allocates SAMTOOLS_SORT_MEMORY for every thread, so a buffer
+    per thread is added on top of the (scaled) memory needed by the rest of
+    the job.
+    """
+    memory = _scale_memory(attempts, initial_value, scale)
+    memory = memory + int(threads) * SAMTOOLS_SORT_MEMORY_MB / 1024
     return f"{memory}G"
 
 
@@ -92,14 +125,26 @@ def define_time_requested(
 
 
 def symlink_file(
-    output_dir: pathlib.Path, source_path: pathlib.Path, new_file_name: str
+    output_dir: pathlib.Path,
+    source_path: pathlib.Path,
+    new_file_name: str,
+    existing: Optional[set] = None,
 ):
     """
     Create a symlink in the output directory with the new file name.
+
+    If a set of the file names already present in the output directory is
+    provided, it is used instead of checking each path on disk and is updated
+    with any newly created link.
     """
 
     new_path = output_dir / new_file_name
-    if not new_path.exists() and source_path.is_file():
+    if existing is not None:
+        already_present = new_file_name in existing
+    else:
+        already_present = new_path.exists()
+
+    if not already_present and source_path.is_file():
         # logger.debug(f"Symlinking {source_path} to {output_dir / new_file_name}")
         if str(source_path) in [".", "..", "", None, "None"]:
             logger.warning(
@@ -107,73 +152,75 @@ def symlink_file(
             )
 
         else:
-            new_path.symlink_to(source_path.resolve())
+            try:
+                new_path.symlink_to(source_path.resolve())
+            except FileExistsError:
+                # Another worker may have created the same link
+                pass
+            if existing is not None:
+                existing.add(new_file_name)
             # logger.debug(f"Symlinked {source_path} to {output_dir / new_file_name} successfully.")
 
 
 def symlink_fastq_files(
-    design: Union[Design, DesignIP], output_dir: str = "seqnado_output/fastqs/"
+    design: Union[Design, DesignIP],
+    output_dir: str = "seqnado_output/fastqs/",
+    max_workers: int = 16,
 ):
     """
     Symlink the fastq files to the output directory.
+
+    The links are created concurrently as the work is bound by filesystem
+    latency rather than CPU.
     """
     output_dir = pathlib.Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    existing = set(os.listdir(output_dir))
 
+    links: List[Tuple[pathlib.Path, str]] = []
     if isinstance(design, Design):
         for fastq_set in design.fastq_sets:
             if fastq_set.is_paired:
-                symlink_file(
-                    output_dir, fastq_set.r1.path, f"{fastq_set.name}_1.fastq.gz"
-                )
-                symlink_file(
-                    output_dir, fastq_set.r2.path, f"{fastq_set.name}_2.fastq.gz"
-                )
+                links.append((fastq_set.r1.path, f"{fastq_set.name}_1.fastq.gz"))
+                links.append((fastq_set.r2.path, f"{fastq_set.name}_2.fastq.gz"))
             else:
-                symlink_file(
-                    output_dir, fastq_set.r1.path, f"{fastq_set.name}.fastq.gz"
-                )
+                links.append((fastq_set.r1.path, f"{fastq_set.name}.fastq.gz"))
 
     elif isinstance(design, DesignIP):
         for experiment in design.experiments:
+            ip_name = f"{experiment.ip.name}_{experiment.ip_performed}"
             if experiment.fastqs_are_paired:
-                symlink_file(
-                    output_dir,
-                    experiment.ip.r1.path,
-                    f"{experiment.ip.name}_{experiment.ip_performed}_1.fastq.gz",
-                )
-                symlink_file(
-                    output_dir,
-                    experiment.ip.r2.path,
-                    f"{experiment.ip.name}_{experiment.ip_performed}_2.fastq.gz",
-                )
+                links.append((experiment.ip.r1.path, f"{ip_name}_1.fastq.gz"))
+                links.append((experiment.ip.r2.path, f"{ip_name}_2.fastq.gz"))
             else:
-                symlink_file(
-                    output_dir,
-                    experiment.ip.r1.path,
-                    f"{experiment.ip.name}_{experiment.ip_performed}.fastq.gz",
-                )
+                links.append((experiment.ip.r1.path, f"{ip_name}.fastq.gz"))
 
             # Control files
             if experiment.has_control:
+                control_name = f"{experiment.control.r1.sample_base_without_ip}_{experiment.control_performed}"
                 if experiment.control.is_paired:
-                    symlink_file(
-                        output_dir,
-                        experiment.control.r1.path,
-                        f"{experiment.control.r1.sample_base_without_ip}_{experiment.control_performed}_1.fastq.gz",
+                    links.append(
+                        (experiment.control.r1.path, f"{control_name}_1.fastq.gz")
                     )
-                    symlink_file(
-                        output_dir,
-                        experiment.control.r2.path,
-                        f"{experiment.control.r1.sample_base_without_ip}_{experiment.control_performed}_2.fastq.gz",
+                    links.append(
+                        (experiment.control.r2.path, f"{control_name}_2.fastq.gz")
                     )
                 else:
-                    symlink_file(
-                        output_dir,
-                        experiment.control.r1.path,
-                        f"{experiment.control.r1.sample_base_without_ip}_{experiment.control_performed}.fastq.gz",
+                    links.append(
+                        (experiment.control.r1.path, f"{control_name}.fastq.gz")
                     )
 
+    if not links:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(links))) as executor:
+        list(
+            executor.map(
+                lambda link: symlink_file(output_dir, *link, existing=existing),
+                links,
+            )
+        )
+
 
 def is_on(param: str) -> bool:
     """
@@ -186,8 +233,7 @@ def is_on(param: str) -> bool:
         - y
         - 1
     """
-    values = ["true", "t", "on", "yes", "y", "1"]
-    if str(param).lower() in values:
+    if str(param).lower() in ON_VALUES:
         return True
     else:
         return False
@@ -195,8 +241,7 @@ def is_on(param: str) -> bool:
 
 def is_off(param: str):
     """Returns True if parameter in "off" values"""
-    values = ["", "none", "f", "n", "no", "false", "0"]
-    if str(param).lower() in values:
+    if str(param).lower() in OFF_VALUES:
         return True
     else:
         return False
@@ -204,8 +249,7 @@ def is_off(param: str):
 
 def is_none(param: str) -> bool:
     """Returns True if parameter is none"""
-    values = ["", "none"]
-    if str(param).lower() in values:
+    if str(param).lower() in NONE_VALUES:
         return True
     else:
         return False
@@ -230,16 +274,15 @@ def format_config_dict(config: Dict) -> Dict:
         if isinstance(value, dict):
             config[key] = format_config_dict(value)
         else:
-            entry = convert_empty_yaml_entry_to_string(value)
+            # Normalise each value once; "none" values are a subset of "off"
+            entry = str(value).lower()
 
-            if is_on(entry):
+            if entry in ON_VALUES:
                 config[key] = True
-            elif is_off(entry):
-                config[key] = False
-            elif is_none(entry):
+            elif entry in OFF_VALUES:
                 config[key] = False
             else:
-                config[key] = entry
+                config[key] = value
 
     return config
 
@@ -303,22 +346,23 @@ def get_scale_method(config: Dict) -> Optional[str]:
 
 
 def remove_unwanted_run_files():
-    import glob
-    import os
     import shutil
 
-    slurm_files = glob.glob("slurm-*.out")
-    sps_files = glob.glob("sps-*")
-    simg_files = glob.glob("*.simg")
+    with os.scandir(".") as entries:
+        unwanted = [
+            entry
+            for entry in entries
+            if (entry.name.startswith("slurm-") and entry.name.endswith(".out"))
+            or entry.name.startswith("sps-")
+            or (entry.name.endswith(".simg") and not entry.name.startswith("."))
+        ]
 
-    for fn in [*slurm_files, *sps_files, *simg_files]:
+    for entry in unwanted:
         try:
-            if not os.path.isdir(fn):
-                os.remove(fn)
+            if not entry.is_dir():
+                os.remove(entry.path)
             else:
-                shutil.rmtree(fn)
+                shutil.rmtree(entry.path)
 
         except Exception as e:
             print(e)
-
-
@@ -1,6 +1,9 @@
-from seqnado.helpers import check_options, define_time_requested, define_memory_requested
+from seqnado.helpers import check_options, define_time_requested, define_memory_requested, define_sort_memory_requested, SAMTOOLS_SORT_MEMORY
 
 
+# samtools sort runs alongside bowtie2 in the same job, so it gets a small share of the threads
+ALIGN_SORT_THREADS = max(1, int(config["bowtie2"]["threads"]) // 4)
+
 
 rule align_paired:
     input:
@@ -14,14 +17,12 @@ rule align_paired:
     threads: config["bowtie2"]["threads"]
     resources:
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
-        mem=lambda wildcards, attempt: define_memory_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
+        mem=lambda wildcards, attempt: define_sort_memory_requested(threads=ALIGN_SORT_THREADS, initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
     log:
         "seqnado_output/logs/align/{sample}.log",
     shell:
         """bowtie2 -p {threads} -x {params.index} -1 {input.fq1} -2 {input.fq2} {params.options} 2> {log} |
-           samtools view -bS - > {output.bam} &&
-           samtools sort -@ {threads} -o {output.bam}_sorted {output.bam} >> {log} 2>&1 &&
-           mv {output.bam}_sorted {output.bam}
+           samtools sort -@ {ALIGN_SORT_THREADS} -m {SAMTOOLS_SORT_MEMORY} -T {output.bam}.tmp -o {output.bam} - >> {log} 2>&1
         """
 
 
@@ -35,15 +36,13 @@ rule align_single:
         bam=temp("seqnado_output/aligned/raw/{sample}.bam"),
     resources:
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
-        mem=lambda wildcards, attempt: define_memory_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
+        mem=lambda wildcards, attempt: define_sort_memory_requested(threads=ALIGN_SORT_THREADS, initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
     threads: config["bowtie2"]["threads"]
     log:
         "seqnado_output/logs/align/{sample}.log",
     shell:
         """bowtie2 -p {threads} -x {params.index} -U {input.fq1} {params.options} 2> {log} |
-            samtools view -bS - > {output.bam} &&
-            samtools sort -@ {threads} -o {output.bam}_sorted {output.bam} &&
-            mv {output.bam}_sorted {output.bam}
+            samtools sort -@ {ALIGN_SORT_THREADS} -m {SAMTOOLS_SORT_MEMORY} -T {output.bam}.tmp -o {output.bam} - >> {log} 2>&1
         """
 
 
@@ -1,21 +1,28 @@
-from seqnado.helpers import check_options, define_time_requested, define_memory_requested
+from seqnado.helpers import check_options, define_time_requested, define_memory_requested, define_sort_memory_requested, SAMTOOLS_SORT_MEMORY
 
 
 rule sort_bam:
     input:
         bam="seqnado_output/aligned/raw/{sample}.bam",
+        # The raw BAM may be moved into place below, so collect its stats first
+        stats="seqnado_output/qc/alignment_raw/{sample}.txt",
     output:
         bam=temp("seqnado_output/aligned/sorted/{sample}.bam"),
     resources:
-        mem=lambda wildcards, attempt: define_memory_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
+        mem=lambda wildcards, attempt, threads: define_sort_memory_requested(threads=threads, initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
     threads: config["samtools"]["threads"]
     log:
         "seqnado_output/logs/sorted/{sample}.log",
     shell:
         """
-        samtools sort {input.bam} -@ {threads} -o {output.bam} -m 900M &&
-        echo 'Sorted bam number of mapped reads:' > {log} 2>&1
+        if [[ "$(samtools view -H {input.bam} | grep '^@HD' || true)" == *"SO:coordinate"* ]]; then
+            mv {input.bam} {output.bam}
+            echo 'Bam already coordinate sorted' > {log} 2>&1
+        else
+            samtools sort {input.bam} -@ {threads} -o {output.bam} -m {SAMTOOLS_SORT_MEMORY} &&
+            echo 'Sorted bam number of mapped reads:' > {log} 2>&1
+        fi
         """
 
 
@@ -143,7 +150,7 @@ if config["shift_atac_reads"]:
                 "seqnado_output/aligned/shifted_for_tn5_insertion/{sample}.bam.tmp"
             ),
         resources:
-            mem=lambda wildcards, attempt: define_memory_requested(initial_value=3, attempts=attempt, scale=SCALE_RESOURCES),
+            mem=lambda wildcards, attempt, threads: define_sort_memory_requested(threads=threads, initial_value=3, attempts=attempt, scale=SCALE_RESOURCES),
             runtime=lambda wildcards, attempt: define_time_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
         threads: 1
         log:
@@ -151,7 +158,7 @@ if config["shift_atac_reads"]:
         shell:
             """
             rsbamtk shift -b {input.bam} -o {output.tmp} &&
-            samtools sort {output.tmp} -@ {threads} -o {output.bam} &&
+            samtools sort {output.tmp} -@ {threads} -m {SAMTOOLS_SORT_MEMORY} -o {output.bam} &&
             samtools index {output.bam} &&
             echo 'Shifted reads' > {log} 2>&1
             """
@@ -197,7 +204,7 @@ rule filter_bam:
     shell:
         """
         samtools view -@ {threads} -h -b {input.bam} {params.options} > {output.bam} &&
-        samtools index {output.bam} &&
+        samtools index -@ {threads} {output.bam} &&
         echo 'Filtered reads' > {log} 2>&1
         """
 
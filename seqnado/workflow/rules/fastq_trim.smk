@@ -1,6 +1,10 @@
 from seqnado.helpers import check_options, define_time_requested, define_memory_requested
 
 
+# trim_galore spawns ~3 processes per core and gains little beyond 4 cores
+TRIM_GALORE_THREADS = min(int(config["trim_galore"].get("threads", 4)), 4)
+
+
 rule trimgalore_paired:
     # Trim reads using trimgalore
     input:
@@ -9,7 +13,7 @@ rule trimgalore_paired:
     output:
         trimmed1=temp("seqnado_output/trimmed/{sample}_1.fastq.gz"),
         trimmed2=temp("seqnado_output/trimmed/{sample}_2.fastq.gz"),
-    threads: 4
+    threads: TRIM_GALORE_THREADS
     resources:
         mem=lambda wildcards, attempt: define_memory_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),
@@ -32,7 +36,7 @@ rule trimgalore_single:
         fq="seqnado_output/fastqs/{sample}.fastq.gz",
     output:
         trimmed=temp("seqnado_output/trimmed/{sample}.fastq.gz"),
-    threads: 4
+    threads: TRIM_GALORE_THREADS
     resources:
         mem=lambda wildcards, attempt: define_memory_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
@@ -3,11 +3,13 @@ from seqnado.helpers import check_options, define_time_requested, define_memory_
 import re
 import pathlib
 
+LANCEOTRON_THRESHOLD_REGEX = re.compile(r"\-c\s+(\d+.?\d*)")
+MACS_PAIRED_FORMAT_REGEX = re.compile(r"-f BAMPE")
+
 
 def get_lanceotron_threshold(wildcards):
     options = config["lanceotron"]["callpeak"]
-    threshold_pattern = re.compile(r"\-c\s+(\d+.?\d*)")
-    threshold = threshold_pattern.search(options).group(1)
+    threshold = LANCEOTRON_THRESHOLD_REGEX.search(options).group(1)
     return threshold
 
 def format_macs_options(wildcards, options):
@@ -15,7 +17,7 @@ def format_macs_options(wildcards, options):
     is_paired = DESIGN.query(query_name).is_paired
     options = check_options(options)
     if not is_paired:
-        options = re.sub(r"-f BAMPE", "", options)
+        options = MACS_PAIRED_FORMAT_REGEX.sub("", options)
     if not options:
         return ""
     else:
@@ -61,7 +63,7 @@ rule macs2_with_input:
     shell:
         """
         macs2 callpeak -t {input.treatment} -c {input.control} -n {params.basename} {params.options} > {log} 2>&1 &&
-        cat {params.raw} | grep -v '^#' | grep -vE '^chr\\s+start\\s+end.*' | grep -v '^$' | cut -f 1-3 > {output.peaks}
+        grep -vE '^#|^chr\\s+start\\s+end.*|^$' {params.raw} | cut -f 1-3 > {output.peaks}
         """
 
 
@@ -84,7 +86,7 @@ rule macs2_no_input:
     shell:
         """
         macs2 callpeak -t {input.treatment} -n {params.basename} {params.options} > {log} 2>&1 &&
-        cat {params.raw} | grep -v '^#' | grep -vE '^chr\\s+start\\s+end.*' | grep -v '^$' | cut -f 1-3 > {output.peaks}
+        grep -vE '^#|^chr\\s+start\\s+end.*|^$' {params.raw} | cut -f 1-3 > {output.peaks}
         """
 
 
@@ -153,7 +155,7 @@ rule lanceotron_with_input:
     shell:
         """
         lanceotron callPeaksInput {input.treatment} -i {input.control} -f {params.outdir} --skipheader > {log} 2>&1 &&
-        cat {params.basename}_L-tron.bed | awk 'BEGIN{{OFS="\\t"}} $4 >= {params.threshold} {{print $1, $2, $3}}' > {output.peaks} 
+        awk 'BEGIN{{OFS="\\t"}} $4 >= {params.threshold} {{print $1, $2, $3}}' {params.basename}_L-tron.bed > {output.peaks} 
         """
 
 
@@ -178,7 +180,7 @@ rule lanceotron_no_input:
     shell:
         """
         lanceotron callPeaks {input.treatment} -f {params.outdir} --skipheader  {params.options} > {log} 2>&1 &&
-        cat {params.basename}_L-tron.bed | cut -f 1-3 > {output.peaks}
+        cut -f 1-3 {params.basename}_L-tron.bed > {output.peaks}
         """
 
 rule seacr:
@@ -2,11 +2,12 @@ from typing import Literal
 from seqnado.helpers import check_options, define_time_requested, define_memory_requested
 import re
 
+LANCEOTRON_THRESHOLD_REGEX = re.compile(r"\-c\s+(\d+.?\d*)")
+
 
 def get_lanceotron_threshold(wildcards):
     options = config["lanceotron"]["callpeak"]
-    threshold_pattern = re.compile(r"\-c\s+(\d+.?\d*)")
-    threshold = threshold_pattern.search(options).group(1)
+    threshold = LANCEOTRON_THRESHOLD_REGEX.search(options).group(1)
     return threshold
 
 
@@ -28,7 +29,7 @@ rule macs2_no_input:
     shell:
         """
         macs2 callpeak -t {input.treatment} -n {params.basename} -f BAMPE {params.options} > {log} 2>&1 &&
-        cat {params.raw} | grep -v '^#' | grep -vE '^chr\\s+start\\s+end.*' | grep -v '^$' | cut -f 1-3 > {output.peaks}
+        grep -vE '^#|^chr\\s+start\\s+end.*|^$' {params.raw} | cut -f 1-3 > {output.peaks}
         """
 
 
@@ -72,5 +73,5 @@ rule lanceotron_no_input:
     shell:
         """
         lanceotron callPeaks {input.treatment} -f {params.outdir} --skipheader  {params.options} > {log} 2>&1 &&
-        cat {params.outdir}/{wildcards.sample}_L-tron.bed | cut -f 1-3 > {output.peaks}
+        cut -f 1-3 {params.outdir}/{wildcards.sample}_L-tron.bed > {output.peaks}
         """
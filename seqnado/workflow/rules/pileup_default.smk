@@ -1,5 +1,5 @@
 import re
-from seqnado.helpers import check_options, define_time_requested, define_memory_requested
+from seqnado.helpers import check_options, define_time_requested, define_memory_requested, define_sort_memory_requested, SAMTOOLS_SORT_MEMORY
 
 def format_deeptools_options(wildcards, options):
     is_paired = DESIGN.query(wildcards.sample).is_paired
@@ -120,7 +120,6 @@ rule fragment_bedgraph:
         bam="seqnado_output/aligned/{sample}.bam",
         bai="seqnado_output/aligned/{sample}.bam.bai",
     output:
-        filtered=temp("seqnado_output/bedgraphs/{sample}.filtered.bam"),
         sort=temp("seqnado_output/bedgraphs/{sample}.sorted.bam"),
         bed=temp("seqnado_output/bedgraphs/{sample}.bed"),
         bed_log=temp("seqnado_output/logs/bedgraphs/{sample}_bamtobed.log"),
@@ -130,13 +129,13 @@ rule fragment_bedgraph:
         genome=config['genome']['chromosome_sizes'],
     threads: 16
     resources:
-        mem=lambda wildcards, attempt: define_memory_requested(initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
+        mem=lambda wildcards, attempt, threads: define_sort_memory_requested(threads=threads, initial_value=2, attempts=attempt, scale=SCALE_RESOURCES),
         runtime=lambda wildcards, attempt: define_time_requested(initial_value=4, attempts=attempt, scale=SCALE_RESOURCES),    
     log:
         "seqnado_output/logs/bedgraphs/{sample}.log",
     shell:"""
-        samtools view -@ {threads} -q 30 -f 2 -h {input.bam} | grep -v chrM > {output.filtered} 2> {log}
-        samtools sort -@ {threads} -m 900M -o {output.sort} -T {output.sort}.tmp {output.filtered} 2>> {log}
+        samtools view -@ {threads} -q 30 -f 2 -h {input.bam} 2> {log} | grep -v chrM |
+        samtools sort -@ {threads} -m {SAMTOOLS_SORT_MEMORY} -o {output.sort} -T {output.sort}.tmp - 2>> {log}
         bedtools bamtobed -bedpe -i {output.sort} > {output.bed} 2>> {output.bed_log}
         awk '$1==$4 && $6-$2 < 1000' {output.bed} > {output.fragments}.temp 2>> {log}
         awk 'BEGIN {{OFS="\t"}} {{print $1, $2, $6}}' {output.fragments}.temp | sort -k1,1 -k2,2n -k3,3n > {output.fragments} 2>> {log}
@@ -41,17 +41,41 @@ def get_norm_factor_spikein(wildcards, negative=False):
         return -norm_factors[wildcards.sample]
 
 
-def format_deeptools_bamcoverage_options(wildcards):
+def _strip_deeptools_scaling_options(options: str) -> str:
     import re
 
-    options = check_options(config["deeptools"]["bamcoverage"])
-
     if "--normalizeUsing" in options:
         options = re.sub("--normalizeUsing [a-zA-Z]+", "", options)
 
     if "--scaleFactor" in options:
         options = re.sub("--scaleFactor [0-9.]+", "", options)
-         
+
+    return options
+
+
+def _strip_homer_scaling_options(options: str) -> str:
+    import re
+
+    if "-norm" in options:
+        options = re.sub("-scale [0-9.]+", "", options)
+
+    return options
+
+
+# Sample independent options are only formatted once
+DEEPTOOLS_BAMCOVERAGE_OPTIONS = _strip_deeptools_scaling_options(
+    check_options(config["deeptools"]["bamcoverage"])
+)
+HOMER_MAKEBIGWIG_OPTIONS = _strip_homer_scaling_options(
+    check_options(config["homer"]["makebigwig"])
+)
+
+
+def format_deeptools_bamcoverage_options(wildcards):
+    import re
+
+    options = DEEPTOOLS_BAMCOVERAGE_OPTIONS
+
     if not DESIGN.query(wildcards.sample).is_paired:
         options = re.sub(r"--extendReads", "", options)
         options = re.sub(r"-e", "", options)
@@ -60,15 +84,9 @@ def format_deeptools_bamcoverage_options(wildcards):
 
 
 def format_homer_make_bigwigs_options(wildcards):
-    import re
-
     norm = int(get_norm_factor_spikein(wildcards) * 1e7)
 
-    options = check_options(config["homer"]["makebigwig"])
-
-    if "-norm" in options:
-        options = re.sub("-scale [0-9.]+", "", options)
-
+    options = HOMER_MAKEBIGWIG_OPTIONS
     options += f" -norm {norm}"
 
     return options
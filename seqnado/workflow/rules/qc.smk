@@ -80,11 +80,11 @@ rule samtools_stats:
         bam="seqnado_output/aligned/raw/{sample}.bam",
     output:
         stats="seqnado_output/qc/alignment_raw/{sample}.txt",
-    threads: 1
+    threads: 4
     resources:
         mem=lambda wildcards, attempt: define_memory_requested(initial_value=1, attempts=attempt, scale=SCALE_RESOURCES),
     shell:
-        """samtools stats {input.bam} > {output.stats}"""
+        """samtools stats -@ {threads} {input.bam} > {output.stats}"""
 
 
 use rule samtools_stats as samtools_stats_filtered with:
@@ -345,28 +345,49 @@ def user_inputs(test_data_path, assay, assay_type, plot_bed):
             return {**defaults, **defaults_snp, **hub, **geo, **plot}
 
 
-@pytest.fixture(scope="function")
-def config_yaml(run_directory, user_inputs, assay_type, monkeypatch):
-    user_inputs = "\n".join(map(str, user_inputs.values())) + "\n"
+def run_seqnado_config(assay_type, cwd, user_inputs="", answers=None):
+    """
+    Runs seqnado-config in cwd, optionally with an answers file.
+    Returns the process, its stderr and the path of the config file.
+    """
+    import yaml
 
-    monkeypatch.setenv("SEQNADO_CONFIG", str(run_directory))
-    monkeypatch.setenv("HOME", str(run_directory))
+    cwd = pathlib.Path(cwd)
+    cwd.mkdir(parents=True, exist_ok=True)
 
     cmd = ["seqnado-config", assay_type]
+    if answers is not None:
+        answers_file = cwd / "answers.yml"
+        with open(answers_file, "w") as f:
+            yaml.dump(answers, f)
+        cmd.extend(["--answers", str(answers_file)])
+
     process = subprocess.Popen(
         cmd,
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
-        cwd=run_directory,
+        cwd=cwd,
     )
 
     stdout, stderr = process.communicate(input=user_inputs)
 
     date = datetime.now().strftime("%Y-%m-%d")
-    config_file_path = (
-        run_directory / f"{date}_{assay_type}_test/config_{assay_type}.yml"
+    config_file_path = cwd / f"{date}_{assay_type}_test/config_{assay_type}.yml"
+
+    return process, stderr, config_file_path
+
+
+@pytest.fixture(scope="function")
+def config_yaml(run_directory, user_inputs, assay_type, monkeypatch):
+    user_inputs = "\n".join(map(str, user_inputs.values())) + "\n"
+
+    monkeypatch.setenv("SEQNADO_CONFIG", str(run_directory))
+    monkeypatch.setenv("HOME", str(run_directory))
+
+    process, stderr, config_file_path = run_seqnado_config(
+        assay_type, run_directory, user_inputs=user_inputs
     )
 
     assert process.returncode == 0, f"seqnado-config failed with stderr: {stderr}"
@@ -374,6 +395,17 @@ def config_yaml(run_directory, user_inputs, assay_type, monkeypatch):
     return config_file_path
 
 
+def answers_from_user_inputs(user_inputs, on=True, off=False):
+    """
+    The same answers as user_inputs, keyed by question, with yes/no given as on/off.
+    """
+    answers = {}
+    for key, value in user_inputs.items():
+        key = "consenus_counts" if key == "consensus_counts" else key
+        answers[key] = {"yes": on, "no": off}.get(value, value)
+    return answers
+
+
 @pytest.fixture(scope="function")
 def config_yaml_for_testing(config_yaml, assay):
     import yaml
@@ -446,6 +478,72 @@ def test_config(config_yaml, assay_type):
     assert os.path.exists(config_yaml), f"{assay_type} config file not created."
 
 
+@pytest.mark.parametrize(
+    "on, off", [(True, False), ("y", "n"), (1, 0)], ids=["bool", "letter", "int"]
+)
+def test_config_answers_file(run_directory, user_inputs, assay_type, on, off):
+    import yaml
+
+    answers = answers_from_user_inputs(user_inputs, on=on, off=off)
+
+    piped = "\n".join(map(str, user_inputs.values())) + "\n"
+    process, stderr, piped_config = run_seqnado_config(
+        assay_type, run_directory / "piped", user_inputs=piped
+    )
+    assert process.returncode == 0, f"seqnado-config failed with stderr: {stderr}"
+
+    process, stderr, answers_config = run_seqnado_config(
+        assay_type, run_directory / f"answers_{on}", answers=answers
+    )
+    assert process.returncode == 0, f"seqnado-config failed with stderr: {stderr}"
+
+    with open(piped_config) as f, open(answers_config) as g:
+        assert yaml.safe_load(f) == yaml.safe_load(g)
+
+
+def test_config_answers_file_defaults(run_directory, assay_type):
+    import yaml
+
+    # Questions missing from the answers file take their defaults,
+    # as they do once piped answers run out
+    process, stderr, piped_config = run_seqnado_config(
+        assay_type, run_directory / "piped_defaults", user_inputs="test\nhg38\n"
+    )
+    assert process.returncode == 0, f"seqnado-config failed with stderr: {stderr}"
+
+    process, stderr, answers_config = run_seqnado_config(
+        assay_type,
+        run_directory / "answers_defaults",
+        answers={"project_name": "test", "genome": "hg38"},
+    )
+    assert process.returncode == 0, f"seqnado-config failed with stderr: {stderr}"
+
+    with open(piped_config) as f, open(answers_config) as g:
+        assert yaml.safe_load(f) == yaml.safe_load(g)
+
+
+@pytest.mark.parametrize(
+    "bad_answers",
+    [
+        ["not", "a", "mapping"],
+        {
+            "project_name": "test",
+            "genome": "hg38",
+            "remove_pcr_duplicates": True,
+            "remove_pcr_duplicates_method": "not_a_method",
+        },
+        {"project_name": "test", "genome": "hg38", "remove_blacklist": "maybe"},
+    ],
+    ids=["not_a_mapping", "invalid_choice", "invalid_boolean"],
+)
+def test_config_answers_file_invalid(run_directory, assay_type, bad_answers):
+    process, stderr, config_file_path = run_seqnado_config(
+        assay_type, run_directory / "invalid_answers", answers=bad_answers
+    )
+    assert process.returncode != 0
+    assert not config_file_path.exists()
+
+
 def test_design(design, assay_type):
     assert os.path.exists(design), f"{assay_type} design file not created."
 